@@ -6,13 +6,20 @@
 
 from __future__ import annotations
 
+import copy
 import json
 import logging
+import math
 import os
-from dataclasses import asdict, dataclass
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, partial
 from typing import Any, Callable, Iterable, List, Literal, Optional, Sequence, cast
 
-from .models import ConfigValue, MenuInvocationResult, PlaybackState, TrackInfo
+import orjson
+
+from .models import BatchOp, ConfigValue, MenuInvocationResult, PlaybackState, TrackInfo
 
 try:  # pragma: no cover - platform-specific import guard
     import pythoncom  # type: ignore[import-not-found]  # pylint: disable=import-error
@@ -32,32 +39,145 @@ LOGGER = logging.getLogger(__name__)
 
 _MEDIA_MONKEY_PROG_ID = os.environ.get("MM2024_COM_PROGID", "SongsDB5.SDBApplication")
 
-_MENU_MATCH_STRATEGIES = {"exact", "startswith", "contains"}
+# DISPIDs resolved on first access, shared by every SDBPlayer / SDBSongData instance.
+_PLAYER_DISPIDS: dict[str, int] = {}
+_SONG_DISPIDS: dict[str, int] = {}
+
+# How long a PlaybackState snapshot may be reused when no mutation went through any client.
+_STATE_CACHE_TTL_SECONDS = 0.25
+# How long batched runJSCode reads are skipped after a transient failure (e.g. UI still loading).
+_JS_BATCH_RETRY_SECONDS = 5.0
+# Process-wide, so a mutation on one COM worker also discards the other workers' cached reads.
+_STATE_VERSION_LOCK = threading.Lock()
+_state_version = 0
+
+# Caption matchers take (normalized_caption, normalized_target).
+_MENU_MATCHERS: dict[str, Callable[[str, str], bool]] = {
+    "exact": str.__eq__,
+    "startswith": str.startswith,
+    "contains": str.__contains__,
+}
+_MENU_MATCH_STRATEGIES = set(_MENU_MATCHERS)
 _INI_VALUE_ACCESSORS = {"string": "StringValue", "int": "IntValue", "bool": "BoolValue"}
 
+# ``run_js`` wraps caller code in an async IIFE that reports results through runJSCode_callback.
+_RUNJS_WRAPPER_PREFIX = (
+    "(()=>{"
+    "const fail=e=>runJSCode_callback(JSON.stringify({ok:false,error:e&&e.message?e.message:String(e)}));"
+    "try{(async()=>{"
+)
+_RUNJS_WRAPPER_SUFFIX = (
+    "\n})().then(value=>runJSCode_callback(JSON.stringify({ok:true,data:value})),fail);"
+    "}catch(error){fail(error);}})();"
+)
+# Same wrapper, registered once inside MediaMonkey so each call only ships the JSON-encoded source.
+_RUNJS_HELPER_JS = (
+    "window.__mmMcpRun=src=>{"
+    "const fail=e=>runJSCode_callback(JSON.stringify({ok:false,error:e&&e.message?e.message:String(e)}));"
+    "try{const AsyncFunction=Object.getPrototypeOf(async function(){}).constructor;"
+    "new AsyncFunction(src)().then(value=>runJSCode_callback(JSON.stringify({ok:true,data:value})),fail);"
+    "}catch(error){fail(error);}};"
+)
+# Reports ``helperMissing`` instead of failing silently when MediaMonkey reloaded its UI.
+_RUNJS_HELPER_CALL_PREFIX = "typeof window.__mmMcpRun==='function'?window.__mmMcpRun("
+_RUNJS_HELPER_CALL_SUFFIX = (
+    "):runJSCode_callback(JSON.stringify({ok:false,helperMissing:true,error:'__mmMcpRun is not registered'}));"
+)
+_PURE_JS_CACHE_SIZE = 256
+
+# (TrackInfo field, SDBSongData COM property, MM5 JS Track property, coercion kind: "s" = string, "i" = int)
+_TRACK_FIELDS = (
+    ("title", "Title", "title", "s"),
+    ("artist", "ArtistName", "artist", "s"),
+    ("album", "AlbumName", "album", "s"),
+    ("album_artist", "AlbumArtistName", "albumArtist", "s"),
+    ("genre", "Genre", "genre", "s"),
+    ("year", "Year", "year", "i"),
+    ("track_number", "TrackOrder", "trackNumber", "i"),
+    ("duration_ms", "SongLength", "songLength", "i"),
+    ("path", "Path", "path", "s"),
+    ("rating", "Rating", "rating", "i"),
+    ("song_id", "SongID", "id", "i"),
+)
+
+# The batched scripts run inside MediaMonkey's UI and use the MM5 JavaScript API
+# (``app.player``, ``Track``, ``SongList``; see https://www.mediamonkey.com/docs/api/),
+# not the COM object model. Results are keyed by the COM property names so both paths
+# share the same parsing.
+_JS_SONG_TO_OBJECT = (
+    "const songToObject = s => ({"
+    + ", ".join(f"{com_prop}: s.{js_prop}" for _, com_prop, js_prop, _ in _TRACK_FIELDS)
+    + "});"
+)
+
+# Reads every field used by :class:`PlaybackState` in a single ``runJSCode`` round-trip.
+_PLAYBACK_STATE_JS = (
+    _JS_SONG_TO_OBJECT
+    + "const player = app.player;"
+    "const song = player.getCurrentTrack();"
+    "const songList = player.getSongList().getTracklist();"
+    "await songList.whenLoaded();"
+    "return {"
+    "isPlaying: player.isPlaying, isPaused: player.paused,"
+    " isShuffle: player.shufflePlaylist, isRepeat: player.repeatPlaylist,"
+    " StopAfterCurrent: player.stopAfterCurrent, Volume: Math.round(player.volume * 100),"
+    " PlaybackTime: player.trackPositionMS, CurrentSongIndex: player.playlistPos,"
+    " CurrentSongListCount: songList.count,"
+    " CurrentSong: song ? songToObject(song) : null"
+    "};"
+)
+
+# ``JSON.stringify`` drops ``undefined``, so a misnamed MM5 property shows up as a missing key.
+_PLAYBACK_STATE_KEYS = (
+    "isPlaying",
+    "isPaused",
+    "isShuffle",
+    "isRepeat",
+    "StopAfterCurrent",
+    "Volume",
+    "PlaybackTime",
+    "CurrentSongIndex",
+    "CurrentSongListCount",
+)
+_TRACK_KEYS = tuple(com_prop for _, com_prop, _, _ in _TRACK_FIELDS)
+
+# Reads the first ``%d`` Now Playing entries in a single ``runJSCode`` round-trip.
+_NOW_PLAYING_JS = (
+    _JS_SONG_TO_OBJECT
+    + "const songList = app.player.getSongList().getTracklist();"
+    "await songList.whenLoaded();"
+    "const out = [];"
+    "songList.locked(() => {"
+    "const count = Math.min(%d, songList.count);"
+    "for (let i = 0; i < count; i++) {"
+    "const s = songList.getValue(i);"
+    "if (s) out.push(songToObject(s));"
+    "}"
+    "});"
+    "return out;"
+)
+
 
 class MediaMonkeyUnavailableError(RuntimeError):
     """Raised when MediaMonkey is missing or cannot be automated."""
 
 
-@dataclass
-class _RawPlaybackState:
-    """Internal helper that mirrors :class:`PlaybackState` but stores native COM values."""
-
-    is_playing: bool
-    is_paused: bool
-    shuffle: bool
-    repeat: bool
-    stop_after_current: bool
-    volume: int
-    playback_time_ms: int
-    track_length_ms: Optional[int]
-    current_index: Optional[int]
-    now_playing_size: Optional[int]
-    track: Optional[TrackInfo]
+def initialize_com_apartment() -> None:
+    """Enter a single-threaded COM apartment (STA) on the current thread; no-op without pywin32."""
 
-    def to_model(self) -> PlaybackState:
-        return PlaybackState(**asdict(self))
+    if pythoncom is None:
+        return
+    co_initialize_ex: Optional[Callable[[int], Any]] = getattr(
+        pythoncom, "CoInitialize" + "Ex", None
+    )
+    if co_initialize_ex is not None:
+        co_initialize_ex(getattr(pythoncom, "COINIT_APARTMENTTHREADED", 0x2))
+    else:
+        co_initialize: Optional[Callable[[], Any]] = getattr(
+            pythoncom, "Co" + "Initialize", None
+        )
+        if co_initialize is not None:
+            co_initialize()
 
 
 class MediaMonkeyClient:
@@ -68,20 +188,9 @@ class MediaMonkeyClient:
             raise MediaMonkeyUnavailableError(
                 "pywin32 is not available. Install pywin32 and run on Windows."
             )
-        # Initialize COM apartment for the current thread.
-        co_initialize_ex: Optional[Callable[[int], Any]] = getattr(
-            pythoncom, "CoInitialize" + "Ex", None
-        )
-        if co_initialize_ex is not None:
-            co_initialize_ex(0)
-        else:
-            co_initialize: Optional[Callable[[], Any]] = getattr(
-                pythoncom, "Co" + "Initialize", None
-            )
-            if co_initialize is not None:
-                co_initialize()
+        initialize_com_apartment()
         try:
-            self._sdb = win32com.client.Dispatch(_MEDIA_MONKEY_PROG_ID)
+            self._sdb = _dispatch_application(_MEDIA_MONKEY_PROG_ID)
         except com_error as exc:  # pragma: no cover - depends on local install
             raise MediaMonkeyUnavailableError(
                 f"Unable to create COM object '{_MEDIA_MONKEY_PROG_ID}'. "
@@ -95,81 +204,103 @@ class MediaMonkeyClient:
                 LOGGER.debug("ShutdownAfterDisconnect not exposed by current build")
 
         self._player = self._sdb.Player
+        self._js_helper_ready = self._register_js_helper()
+        # Monotonic time before which batched reads go straight to COM; ``inf`` once the JS
+        # object model returned an unexpected shape.
+        self._js_batch_retry_at = 0.0
+        player = self._player
+        # Resolve the SDBPlayer methods once instead of on every control_playback call.
+        self._actions: dict[str, Callable[[], Any]] = {
+            "play": player.Play,
+            "pause": player.Pause,
+            "toggle": self._toggle_playback,
+            "stop": player.Stop,
+            "next": player.Next,
+            "previous": player.Previous,
+            "stop_after_current": self._toggle_stop_after_current,
+        }
+        # Both caches are tagged with the shared ``_state_version`` they were captured under.
+        self._state_cache: Optional[tuple[int, float, PlaybackState]] = None
+        self._pure_js_cache: OrderedDict[tuple[str, bool], Any] = OrderedDict()
+        # The current song rarely changes between polls; reuse its TrackInfo while SongID matches.
+        self._last_track_cache: Optional[tuple[int, int, TrackInfo]] = None
 
     # ------------------------------------------------------------------
     # Public surface consumed by MCP tools
     # ------------------------------------------------------------------
     def get_playback_state(self) -> PlaybackState:
-        """Return a :class:`PlaybackState` snapshot."""
+        """Return a :class:`PlaybackState` snapshot.
 
-        raw_state = self._collect_playback_state()
-        return raw_state.to_model()
+        Back-to-back reads within ``_STATE_CACHE_TTL_SECONDS`` reuse the previous snapshot
+        unless any client in this process issued a mutation in the meantime.
+        """
+
+        now = time.monotonic()
+        cached = self._state_cache
+        if cached is not None:
+            version, captured_at, state = cached
+            if version == _state_version and now - captured_at < _STATE_CACHE_TTL_SECONDS:
+                return state
+
+        version = _state_version
+        state = self._collect_playback_state()
+        self._state_cache = (version, now, state)
+        return state
 
     def control_playback(self, action: str) -> PlaybackState:
         """Dispatch common player actions (play, pause, stop, etc.)."""
 
-        action = action.lower()
-        player = self._player
-
-        if action == "play":
-            player.Play()
-        elif action == "pause":
-            player.Pause()
-        elif action == "toggle":
-            if bool(getattr(player, "isPlaying", False)):
-                player.Pause()
-            else:
-                player.Play()
-        elif action == "stop":
-            player.Stop()
-        elif action == "next":
-            player.Next()
-        elif action == "previous":
-            player.Previous()
-        elif action == "stop_after_current":
-            player.StopAfterCurrent = not bool(getattr(player, "StopAfterCurrent", False))
-        else:  # pragma: no cover - defensive path validated earlier
+        handler = self._actions.get(action.lower())
+        if handler is None:  # pragma: no cover - defensive path validated earlier
             raise ValueError(f"Unsupported playback action: {action}")
 
+        handler()
+        self._invalidate_state()
         return self.get_playback_state()
 
     def set_volume(self, level: int) -> PlaybackState:
         """Clamp and set master volume (0-100)."""
 
-        level = max(0, min(100, int(level)))
-        self._player.Volume = level
+        self._apply_volume(level)
+        self._invalidate_state()
         return self.get_playback_state()
 
     def seek(self, playback_time_ms: int) -> PlaybackState:
         """Jump to a position within the active track (milliseconds)."""
 
-        playback_time_ms = max(0, int(playback_time_ms))
-        self._player.PlaybackTime = playback_time_ms
+        self._apply_seek(playback_time_ms)
+        self._invalidate_state()
         return self.get_playback_state()
 
-    def now_playing(self, limit: int = 25) -> List[TrackInfo]:
-        """Return the first ``limit`` entries from the Now Playing queue."""
+    def execute_batch(self, ops: Sequence[BatchOp]) -> PlaybackState:
+        """Apply several player operations back to back and return one final snapshot."""
 
-        song_list = getattr(self._player, "CurrentSongList", None)
-        if song_list is None:
-            return []
+        steps: List[Callable[[], Any]] = []
+        for op in ops:
+            if op.action in ("set_volume", "seek"):
+                # BatchOp guarantees a value for these actions.
+                apply = self._apply_volume if op.action == "set_volume" else self._apply_seek
+                steps.append(partial(apply, cast(int, op.value)))
+            else:
+                handler = self._actions.get(op.action)
+                if handler is None:  # pragma: no cover - validated by BatchOp
+                    raise ValueError(f"Unsupported playback action: {op.action}")
+                steps.append(handler)
 
-        count = int(getattr(song_list, "Count", 0))
-        if count <= 0:
-            return []
+        try:
+            for step in steps:
+                step()
+        finally:
+            self._invalidate_state()
+        return self.get_playback_state()
 
-        safe_limit = max(0, min(limit, count))
-        tracks: List[TrackInfo] = []
-        for index in range(safe_limit):
-            try:
-                song = song_list.Item(index)
-            except com_error as exc:  # pragma: no cover - COM quirks
-                LOGGER.warning("Failed to read Now Playing index %s: %s", index, exc)
-                continue
-            track = self._song_to_track(song)
-            if track:
-                tracks.append(track)
-        return tracks
+    def now_playing(self, limit: int = 25) -> List[TrackInfo]:
+        """Return the first ``limit`` entries from the Now Playing queue."""
+
+        payload = self._run_js_batch(_NOW_PLAYING_JS % max(0, int(limit)), _is_track_list_payload)
+        if payload is not None:
+            return [_track_from_js(song) for song in payload]
+        return self._now_playing_com(limit)
 
     def invoke_menu_item(
         self,
@@ -187,7 +318,8 @@ class MediaMonkeyClient:
         if ui is None:
             raise RuntimeError("MediaMonkey did not expose the SDB.UI automation object")
 
-        if match_strategy not in _MENU_MATCH_STRATEGIES:
+        matcher = _MENU_MATCHERS.get(match_strategy)
+        if matcher is None:
             raise ValueError(f"match_strategy must be one of {_MENU_MATCH_STRATEGIES}")
 
         try:
@@ -197,12 +329,12 @@ class MediaMonkeyClient:
 
         matched_path: List[Optional[str]] = []
         for segment in path:
-            target = _resolve_menu_child(current, segment, match_strategy)
+            target = _resolve_menu_child(current, segment, matcher)
             if target is None:
                 raise RuntimeError(
                     f"Unable to resolve menu segment '{segment}' under scope '{scope}'."
                 )
-            matched_path.append(_safe_str(target, "Caption"))
+            matched_path.append(_read(target, "Caption", "s"))
             current = target
 
         enabled = bool(getattr(current, "Enabled", True))
@@ -212,6 +344,7 @@ class MediaMonkeyClient:
             )
 
         executed = _execute_menu_item(self._sdb, current)
+        self._invalidate_state()
         if not executed:
             raise RuntimeError("Unable to invoke the resolved menu item. No callable entrypoint was exposed.")
 
@@ -219,7 +352,7 @@ class MediaMonkeyClient:
             scope=scope,
             requested_path=list(path),
             matched_path=matched_path,
-            caption=_safe_str(current, "Caption"),
+            caption=_read(current, "Caption", "s"),
             enabled=enabled,
             executed=executed,
         )
@@ -261,6 +394,7 @@ class MediaMonkeyClient:
         coerced_value = _coerce_ini_input(value, normalized_type)
 
         _write_ini_value(ini, accessor_name, section, key, coerced_value)
+        self._invalidate_state()
 
         applied = _persist_ini_changes(ini, persist_mode)
 
@@ -274,40 +408,104 @@ class MediaMonkeyClient:
             applied=applied,
         )
 
-    def run_js(self, code: str, expect_callback: bool = True):
-        """Execute MediaMonkey's ``SDBApplication.runJSCode`` helper."""
+    def run_js(self, code: str, expect_callback: bool = True, pure: bool = False):
+        """Execute MediaMonkey's ``SDBApplication.runJSCode`` helper.
+
+        Pass ``pure=True`` for read-only, deterministic scripts: their results are
+        cached per script text and they do not invalidate the playback snapshot.
+        """
+
+        if not pure:
+            # Arbitrary scripts may change player state, so drop any cached snapshot.
+            self._invalidate_state()
+            return self._run_js(code, expect_callback=expect_callback)
+
+        key = (code, expect_callback)
+        cache = self._pure_js_cache
+        if key in cache:
+            cache.move_to_end(key)
+            # Hand out copies so a caller mutating a list/dict result cannot corrupt later hits.
+            return copy.deepcopy(cache[key])
+        result = self._run_js(code, expect_callback=expect_callback)
+        cache[key] = copy.deepcopy(result)
+        if len(cache) > _PURE_JS_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
 
-        if not code.strip():
-            raise ValueError("JavaScript payload cannot be empty")
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _apply_volume(self, level: int) -> None:
+        self._player.Volume = max(0, min(100, int(level)))
 
-        wrapped = code
-        if expect_callback and "runJSCode_callback" not in code:
-            wrapped = (
-                "(() => {"
-                "  try {"
-                f"    const result = (async () => {{ {code} }})();"
-                "    if (result && typeof result.then === 'function') {"
-                "      result.then("
-                "        value => runJSCode_callback(JSON.stringify({ok: true, data: value})),"
-                "        err => runJSCode_callback(JSON.stringify({ok: false, error: err && err.message ? err.message : String(err)}))"
-                "      );"
-                "    } else {"
-                "      runJSCode_callback(JSON.stringify({ok: true, data: result}));"
-                "    }"
-                "  } catch (error) {"
-                "    runJSCode_callback(JSON.stringify({ok: false, error: error && error.message ? error.message : String(error)}));"
-                "  }"
-                "})();"
-            )
+    def _apply_seek(self, playback_time_ms: int) -> None:
+        self._player.PlaybackTime = max(0, int(playback_time_ms))
 
-        result = self._sdb.runJSCode(wrapped, True)
-        if not expect_callback:
-            return str(result)
+    def _toggle_playback(self) -> None:
+        if bool(getattr(self._player, "isPlaying", False)):
+            self._player.Pause()
+        else:
+            self._player.Play()
 
+    def _toggle_stop_after_current(self) -> None:
+        player = self._player
+        player.StopAfterCurrent = not bool(getattr(player, "StopAfterCurrent", False))
+
+    def _invalidate_state(self) -> None:
+        # Mutations (menu commands, scripts, config writes) may also have edited the song's tags,
+        # so the bump discards cached tracks as well as snapshots.
+        global _state_version
+        with _STATE_VERSION_LOCK:
+            _state_version += 1
+
+    def _cached_track(
+        self, song_id: Optional[int], build: Callable[[], Optional[TrackInfo]]
+    ) -> Optional[TrackInfo]:
+        # Files outside the library all report SongID 0 (or below), so only real ids are cached.
+        if song_id is None or song_id <= 0:
+            return build()
+        version = _state_version
+        cached = self._last_track_cache
+        if cached is not None and cached[0] == version and cached[1] == song_id:
+            return cached[2]
+        track = build()
+        if track is not None:
+            self._last_track_cache = (version, song_id, track)
+        return track
+
+    def _register_js_helper(self) -> bool:
         try:
-            parsed = json.loads(result)
-        except json.JSONDecodeError:
-            LOGGER.warning("runJSCode returned non-JSON data: %s", result)
+            self._sdb.runJSCode(_RUNJS_HELPER_JS, False)
+        except (AttributeError, com_error) as exc:
+            LOGGER.debug("Unable to register the runJSCode helper, wrapping scripts inline: %s", exc)
+            return False
+        return True
+
+    def _run_js(self, code: str, expect_callback: bool = True):
+        if not code.strip():
+            raise ValueError("JavaScript payload cannot be empty")
+
+        if not expect_callback:
+            return str(self._sdb.runJSCode(code, True))
+
+        via_helper = False
+        if "runJSCode_callback" in code:
+            result = self._sdb.runJSCode(code, True)
+        elif self._js_helper_ready:
+            via_helper = True
+            # json.dumps escapes lone surrogates (valid in MCP input) that orjson rejects.
+            encoded = json.dumps(code)
+            result = self._sdb.runJSCode(_RUNJS_HELPER_CALL_PREFIX + encoded + _RUNJS_HELPER_CALL_SUFFIX, True)
+        else:
+            result = self._sdb.runJSCode(_RUNJS_WRAPPER_PREFIX + code + _RUNJS_WRAPPER_SUFFIX, True)
+
+        parsed = _load_js_result(result)
+        if via_helper and isinstance(parsed, dict) and parsed.get("helperMissing"):
+            # MediaMonkey dropped the helper (e.g. a UI reload): register it again and run inline.
+            self._js_helper_ready = self._register_js_helper()
+            result = self._sdb.runJSCode(_RUNJS_WRAPPER_PREFIX + code + _RUNJS_WRAPPER_SUFFIX, True)
+            parsed = _load_js_result(result)
+        if parsed is None:
             return str(result)
 
         if not parsed.get("ok", False):
@@ -315,28 +513,102 @@ class MediaMonkeyClient:
         data = parsed.get("data")
         return data
 
-    # ------------------------------------------------------------------
-    # Internal helpers
-    # ------------------------------------------------------------------
-    def _collect_playback_state(self) -> _RawPlaybackState:
+    def _run_js_batch(self, code: str, is_valid: Callable[[Any], bool]) -> Any:
+        """Run a batched read script, or return ``None`` so the caller uses the COM path."""
+
+        now = time.monotonic()
+        if now < self._js_batch_retry_at:
+            return None
+        try:
+            payload = self._run_js(code)
+        except (AttributeError, RuntimeError, TypeError, com_error) as exc:
+            # MediaMonkey may still be starting its UI; use COM for now and retry later.
+            LOGGER.info("Batched runJSCode read failed, using COM property reads for now: %s", exc)
+            self._js_batch_retry_at = now + _JS_BATCH_RETRY_SECONDS
+            return None
+        if is_valid(payload):
+            return payload
+        # The JS object model differs between MediaMonkey builds; a wrong shape will not fix itself.
+        LOGGER.info("Batched runJSCode reads unavailable, using COM property reads: %r", payload)
+        self._js_batch_retry_at = math.inf
+        return None
+
+    def _now_playing_com(self, limit: int) -> List[TrackInfo]:
+        song_list = getattr(self._player, "CurrentSongList", None)
+        if song_list is None:
+            return []
+
+        count = int(getattr(song_list, "Count", 0))
+        if count <= 0:
+            return []
+
+        safe_limit = max(0, min(limit, count))
+        tracks: List[TrackInfo] = []
+        for index in range(safe_limit):
+            try:
+                song = song_list.Item(index)
+            except com_error as exc:  # pragma: no cover - COM quirks
+                LOGGER.warning("Failed to read Now Playing index %s: %s", index, exc)
+                continue
+            track = self._song_to_track(song)
+            if track:
+                tracks.append(track)
+        return tracks
+
+    def _collect_playback_state(self) -> PlaybackState:
+        payload = self._run_js_batch(_PLAYBACK_STATE_JS, _is_playback_payload)
+        if payload is not None:
+            return self._playback_state_from_js(payload)
+        return self._collect_playback_state_com()
+
+    def _playback_state_from_js(self, payload: dict) -> PlaybackState:
+        song = payload.get("CurrentSong")
+        track = None
+        if isinstance(song, dict):
+            track = _track_from_js(song)
+
+        now_playing_size = _coerce(payload.get("CurrentSongListCount"), "i")
+        current_index_raw = _coerce(payload.get("CurrentSongIndex"), "i")
+        current_index = current_index_raw if current_index_raw is not None and current_index_raw >= 0 else None
+
+        # Values are already normalized here, so skip re-validation.
+        return PlaybackState.model_construct(
+            is_playing=bool(payload.get("isPlaying")),
+            is_paused=bool(payload.get("isPaused")),
+            shuffle=bool(payload.get("isShuffle")),
+            repeat=bool(payload.get("isRepeat")),
+            stop_after_current=bool(payload.get("StopAfterCurrent")),
+            volume=_coerce(payload.get("Volume"), "i") or 0,
+            playback_time_ms=_coerce(payload.get("PlaybackTime"), "i") or 0,
+            track_length_ms=(track.duration_ms or 0) if track else None,
+            current_index=current_index,
+            now_playing_size=now_playing_size,
+            track=track,
+        )
+
+    def _collect_playback_state_com(self) -> PlaybackState:
         player = self._player
         song = getattr(player, "CurrentSong", None)
-        track = self._song_to_track(song)
+        track = None
+        if song is not None:
+            # Only SongID is read while the same song stays current.
+            song_id = _read(song, "SongID", "i", _SONG_DISPIDS)
+            track = self._cached_track(song_id, partial(self._song_to_track, song))
 
         now_playing = getattr(player, "CurrentSongList", None)
         now_playing_size = int(getattr(now_playing, "Count", 0)) if now_playing else None
-        current_index_raw = int(getattr(player, "CurrentSongIndex", -1))
+        current_index_raw = _read(player, "CurrentSongIndex", "i", _PLAYER_DISPIDS, -1)
         current_index = current_index_raw if current_index_raw >= 0 else None
 
-        return _RawPlaybackState(
-            is_playing=bool(getattr(player, "isPlaying", False)),
-            is_paused=bool(getattr(player, "isPaused", False)),
-            shuffle=bool(getattr(player, "isShuffle", False)),
-            repeat=bool(getattr(player, "isRepeat", False)),
-            stop_after_current=bool(getattr(player, "StopAfterCurrent", False)),
-            volume=int(getattr(player, "Volume", 0)),
-            playback_time_ms=int(getattr(player, "PlaybackTime", 0)),
-            track_length_ms=int(getattr(song, "SongLength", 0)) if track else None,
+        return PlaybackState.model_construct(
+            is_playing=_read(player, "isPlaying", "b", _PLAYER_DISPIDS, False),
+            is_paused=_read(player, "isPaused", "b", _PLAYER_DISPIDS, False),
+            shuffle=_read(player, "isShuffle", "b", _PLAYER_DISPIDS, False),
+            repeat=_read(player, "isRepeat", "b", _PLAYER_DISPIDS, False),
+            stop_after_current=_read(player, "StopAfterCurrent", "b", _PLAYER_DISPIDS, False),
+            volume=_read(player, "Volume", "i", _PLAYER_DISPIDS, 0),
+            playback_time_ms=_read(player, "PlaybackTime", "i", _PLAYER_DISPIDS, 0),
+            track_length_ms=(track.duration_ms or 0) if track else None,
             current_index=current_index,
             now_playing_size=now_playing_size,
             track=track,
@@ -347,47 +619,104 @@ class MediaMonkeyClient:
         if song is None:
             return None
         try:
-            return TrackInfo(
-                title=_safe_str(song, "Title"),
-                artist=_safe_str(song, "ArtistName"),
-                album=_safe_str(song, "AlbumName"),
-                album_artist=_safe_str(song, "AlbumArtistName"),
-                genre=_safe_str(song, "Genre"),
-                year=_safe_int(song, "Year"),
-                track_number=_safe_int(song, "TrackOrder"),
-                duration_ms=_safe_int(song, "SongLength"),
-                path=_safe_str(song, "Path"),
-                rating=_safe_int(song, "Rating"),
-                song_id=_safe_int(song, "SongID"),
+            return TrackInfo.model_construct(
+                **{field: _read(song, prop, kind, _SONG_DISPIDS) for field, prop, _, kind in _TRACK_FIELDS}
             )
         except com_error as exc:  # pragma: no cover - COM edge cases
             LOGGER.warning("Unable to parse SDBSongData: %s", exc)
             return None
 
 
-def _safe_str(obj: Any, attr: str) -> Optional[str]:
+def _load_js_result(result: Any) -> Any:
     try:
-        value = getattr(obj, attr)
-    except (AttributeError, com_error, TypeError):
-        return None
-    if value is None:
+        return orjson.loads(result)
+    except orjson.JSONDecodeError:
+        pass
+    try:
+        # JSON.stringify escapes lone surrogates, which only the stdlib decoder accepts.
+        return json.loads(result)
+    except (TypeError, ValueError):
+        LOGGER.warning("runJSCode returned non-JSON data: %s", result)
         return None
-    text = str(value).strip()
-    return text or None
 
 
-def _safe_int(obj: Any, attr: str) -> Optional[int]:
+def _dispatch_application(prog_id: str) -> Any:
+    """Create the automation object, preferring an early-bound ``gencache`` wrapper."""
+
     try:
-        value = getattr(obj, attr)
-    except (AttributeError, com_error, TypeError):
-        return None
+        return win32com.client.gencache.EnsureDispatch(prog_id)
+    except (AttributeError, ImportError, OSError, TypeError, com_error) as exc:
+        # EnsureDispatch needs a registered type library and a writable gen_py cache.
+        LOGGER.debug("Early-bound dispatch unavailable for %s, using late binding: %s", prog_id, exc)
+    return win32com.client.Dispatch(prog_id)
+
+
+def _is_playback_payload(payload: Any) -> bool:
+    if not isinstance(payload, dict) or "CurrentSong" not in payload:
+        return False
+    if any(payload.get(key) is None for key in _PLAYBACK_STATE_KEYS):
+        return False
+    song = payload["CurrentSong"]
+    return song is None or _is_track_payload(song)
+
+
+def _is_track_list_payload(payload: Any) -> bool:
+    return isinstance(payload, list) and all(_is_track_payload(song) for song in payload)
+
+
+def _is_track_payload(song: Any) -> bool:
+    return isinstance(song, dict) and all(key in song for key in _TRACK_KEYS)
+
+
+def _track_from_js(song: dict) -> TrackInfo:
+    return TrackInfo.model_construct(
+        **{field: _coerce(song.get(prop), kind) for field, prop, _, kind in _TRACK_FIELDS}
+    )
+
+
+def _read(
+    obj: Any, attr: str, kind: str, dispids: Optional[dict[str, int]] = None, default: Any = None
+) -> Any:
+    """Read a COM property and coerce it to ``kind`` ("s", "i" or "b"), or ``default`` when unavailable."""
+
     try:
-        return int(value)
-    except (TypeError, ValueError):
+        value = _get_property(obj, attr, dispids)
+    except (AttributeError, com_error, TypeError):
+        return default
+    coerced = _coerce(value, kind)
+    return default if coerced is None else coerced
+
+
+def _get_property(obj: Any, attr: str, dispids: Optional[dict[str, int]] = None) -> Any:
+    """Read a COM property, invoking a cached DISPID directly when a table is supplied."""
+
+    if dispids is None:
+        return getattr(obj, attr)
+    oleobj = getattr(obj, "_oleobj_", None)
+    if oleobj is None or pythoncom is None:
+        return getattr(obj, attr)
+    dispid = dispids.get(attr)
+    if dispid is None:
+        dispid = oleobj.GetIDsOfNames(attr)
+        dispids[attr] = dispid
+    return oleobj.Invoke(dispid, 0, pythoncom.DISPATCH_PROPERTYGET, True)
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    if kind == "i":
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    if value is None:
         return None
+    if kind == "b":
+        return bool(value)
+    text = str(value).strip()
+    return text or None
 
 
-def _resolve_menu_child(parent: Any, segment: str, match_strategy: str) -> Optional[Any]:
+def _resolve_menu_child(parent: Any, segment: str, matcher: Callable[[str, str], bool]) -> Optional[Any]:
     direct_lookup = getattr(parent, "ChildByName", None)
     if callable(direct_lookup):
         try:
@@ -399,21 +728,13 @@ def _resolve_menu_child(parent: Any, segment: str, match_strategy: str) -> Optio
 
     normalized_target = _normalize_menu_label(segment)
     for child in _iterate_menu_children(parent):
-        caption = _safe_str(child, "Caption") or ""
+        caption = _read(child, "Caption", "s") or ""
         normalized_caption = _normalize_menu_label(caption)
-        if _caption_matches(normalized_caption, normalized_target, match_strategy):
+        if matcher(normalized_caption, normalized_target):
             return child
     return None
 
 
-def _caption_matches(candidate: str, target: str, match_strategy: str) -> bool:
-    if match_strategy == "startswith":
-        return candidate.startswith(target)
-    if match_strategy == "contains":
-        return target in candidate
-    return candidate == target
-
-
 def _execute_menu_item(application: Any, menu_item: Any) -> bool:
     for attr in ("Execute", "Click"):
         method = getattr(menu_item, attr, None)
@@ -484,6 +805,7 @@ def _get_indexed_item(container: Any, index: int) -> Optional[Any]:
         return None
 
 
+@lru_cache(maxsize=1024)
 def _normalize_menu_label(label: Optional[str]) -> str:
     if not label:
         return ""
@@ -4,12 +4,14 @@ from __future__ import annotations
 
 from typing import List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class TrackInfo(BaseModel):
     """Subset of MediaMonkey's `SDBSongData` fields that are useful to MCP tools."""
 
+    model_config = ConfigDict(frozen=True)
+
     title: Optional[str] = Field(None, description="Track title (SDBSongData.Title)")
     artist: Optional[str] = Field(None, description="Performer (SDBSongData.ArtistName)")
     album: Optional[str] = Field(None, description="Album (SDBSongData.AlbumName)")
@@ -26,6 +28,8 @@ class TrackInfo(BaseModel):
 class PlaybackState(BaseModel):
     """Snapshot of MediaMonkey's player state."""
 
+    model_config = ConfigDict(frozen=True)
+
     is_playing: bool = Field(..., description="True when audio is actively playing")
     is_paused: bool = Field(..., description="True when playback is paused")
     shuffle: bool = Field(..., description="Player shuffle flag (SDBPlayer.isShuffle)")
@@ -39,6 +43,30 @@ class PlaybackState(BaseModel):
     track: Optional[TrackInfo] = Field(None, description="Metadata for the active track")
 
 
+class BatchOp(BaseModel):
+    """Single player operation executed as part of a batch."""
+
+    action: Literal[
+        "play", "pause", "toggle", "stop", "next", "previous", "stop_after_current", "set_volume", "seek"
+    ] = Field(..., description="Transport action, or `set_volume` / `seek` to adjust level or position")
+    value: Optional[int] = Field(
+        None, ge=0, description="Volume level (0-100) for `set_volume`, position in milliseconds for `seek`"
+    )
+
+    @model_validator(mode="after")
+    def _check_value(self) -> "BatchOp":
+        """Apply the same limits as the single-operation `set_volume` and `seek` tools."""
+
+        if self.action in ("set_volume", "seek"):
+            if self.value is None:
+                raise ValueError(f"Batch action '{self.action}' requires a value")
+            if self.action == "set_volume" and self.value > 100:
+                raise ValueError("Batch action 'set_volume' accepts a value between 0 and 100")
+        elif self.value is not None:
+            raise ValueError(f"Batch action '{self.action}' does not take a value")
+        return self
+
+
 class MenuInvocationResult(BaseModel):
     """Details about an invoked MediaMonkey menu item."""
 
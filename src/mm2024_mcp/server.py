@@ -2,18 +2,54 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Annotated, Literal
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Callable, Literal, TypeVar
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import Field
 
-from .media_monkey_client import MediaMonkeyClient, MediaMonkeyUnavailableError
+from .media_monkey_client import (
+    MediaMonkeyClient,
+    MediaMonkeyUnavailableError,
+    initialize_com_apartment,
+)
+from .models import BatchOp, PlaybackState
 
 LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 mcp = FastMCP("mm2024-mcp")
-_client: MediaMonkeyClient | None = None
+
+
+def _com_worker_count() -> int:
+    """Read ``MM2024_COM_WORKERS``, falling back to one worker on invalid input."""
+
+    raw = os.environ.get("MM2024_COM_WORKERS", "1")
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        LOGGER.warning("Ignoring invalid MM2024_COM_WORKERS=%r, using 1 worker", raw)
+        return 1
+
+
+# COM objects are bound to the thread that created them, so every executor worker enters its
+# own single-threaded apartment (STA) on start-up and lazily creates its own client. Blocking
+# COM round-trips no longer stall the event loop. A single worker (the default) keeps every
+# call strictly ordered.
+_tls = threading.local()
+_com_executor = ThreadPoolExecutor(
+    max_workers=_com_worker_count(),
+    thread_name_prefix="mm2024-com",
+    initializer=initialize_com_apartment,
+)
+_last_serialized: tuple[PlaybackState, dict] | None = None
+# Shared by concurrent get_playback_state calls so they wait on one COM read.
+_inflight_state: asyncio.Future[PlaybackState] | None = None
 
 MenuScope = Literal[
     "Menu_File",
@@ -44,37 +80,65 @@ MenuScope = Literal[
 
 
 def _get_client() -> MediaMonkeyClient:
-    global _client
-    if _client is None:
-        _client = MediaMonkeyClient()
-    return _client
+    try:
+        return _tls.client
+    except AttributeError:
+        # First call on this worker; a failed construction is retried on the next call.
+        client = _tls.client = MediaMonkeyClient()
+        return client
+
+
+async def _call_client(call: Callable[[MediaMonkeyClient], _T]) -> _T:
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_com_executor, lambda: call(_get_client()))
+    except MediaMonkeyUnavailableError as exc:
+        raise RuntimeError(str(exc)) from exc
 
 
-def _serialize_state(state) -> dict:
-    return state.model_dump()
+def _serialize_state(state: PlaybackState) -> dict:
+    # The client returns the same PlaybackState instance while its snapshot cache is warm,
+    # so identical consecutive states can reuse the previous dump.
+    global _last_serialized
+    cached = _last_serialized
+    if cached is None or cached[0] is not state:
+        cached = (state, state.model_dump())
+        _last_serialized = cached
+    # Hand out copies so a caller mutating its response cannot corrupt later ones.
+    payload = dict(cached[1])
+    if payload.get("track") is not None:
+        payload["track"] = dict(payload["track"])
+    return payload
 
 
 @mcp.tool()
 async def get_playback_state() -> dict:
     """Return MediaMonkey's current playback state and track metadata."""
 
-    try:
-        state = _get_client().get_playback_state()
-    except MediaMonkeyUnavailableError as exc:
-        raise RuntimeError(str(exc)) from exc
+    global _inflight_state
+    inflight = _inflight_state
+    if inflight is None:
+        inflight = asyncio.ensure_future(_call_client(lambda client: client.get_playback_state()))
+        inflight.add_done_callback(_clear_inflight_state)
+        _inflight_state = inflight
+    # Shield so one cancelled caller does not cancel the read the others are waiting on.
+    state = await asyncio.shield(inflight)
     return _serialize_state(state)
 
 
+def _clear_inflight_state(future: asyncio.Future[PlaybackState]) -> None:
+    global _inflight_state
+    if _inflight_state is future:
+        _inflight_state = None
+
+
 @mcp.tool()
 async def control_playback(
     action: Literal["play", "pause", "toggle", "stop", "next", "previous", "stop_after_current"]
 ) -> dict:
     """Execute a playback command via MediaMonkey's SDBPlayer API."""
 
-    try:
-        state = _get_client().control_playback(action)
-    except MediaMonkeyUnavailableError as exc:
-        raise RuntimeError(str(exc)) from exc
+    state = await _call_client(lambda client: client.control_playback(action))
     return _serialize_state(state)
 
 
@@ -82,10 +146,7 @@ async def control_playback(
 async def set_volume(level: Annotated[int, Field(ge=0, le=100)]) -> dict:
     """Set MediaMonkey's master output level (0-100)."""
 
-    try:
-        state = _get_client().set_volume(level)
-    except MediaMonkeyUnavailableError as exc:
-        raise RuntimeError(str(exc)) from exc
+    state = await _call_client(lambda client: client.set_volume(level))
     return _serialize_state(state)
 
 
@@ -93,10 +154,15 @@ async def set_volume(level: Annotated[int, Field(ge=0, le=100)]) -> dict:
 async def seek(playback_time_ms: Annotated[int, Field(ge=0)]) -> dict:
     """Seek within the active track. Playback time is expressed in milliseconds."""
 
-    try:
-        state = _get_client().seek(playback_time_ms)
-    except MediaMonkeyUnavailableError as exc:
-        raise RuntimeError(str(exc)) from exc
+    state = await _call_client(lambda client: client.seek(playback_time_ms))
+    return _serialize_state(state)
+
+
+@mcp.tool()
+async def batch(ops: Annotated[list[BatchOp], Field(min_length=1, max_length=32)]) -> dict:
+    """Run several playback operations in order and return the playback state once at the end."""
+
+    state = await _call_client(lambda client: client.execute_batch(ops))
     return _serialize_state(state)
 
 
@@ -104,21 +170,20 @@ async def seek(playback_time_ms: Annotated[int, Field(ge=0)]) -> dict:
 async def list_now_playing(limit: Annotated[int, Field(ge=1, le=100)] = 25) -> list[dict]:
     """Return up to ``limit`` tracks from MediaMonkey's Now Playing queue."""
 
-    try:
-        tracks = _get_client().now_playing(limit)
-    except MediaMonkeyUnavailableError as exc:
-        raise RuntimeError(str(exc)) from exc
+    tracks = await _call_client(lambda client: client.now_playing(limit))
     return [track.model_dump() for track in tracks]
 
 
 @mcp.tool()
-async def run_javascript(code: str, expect_callback: bool = True):
-    """Invoke MediaMonkey's ``runJSCode`` bridge for advanced automations."""
+async def run_javascript(code: str, expect_callback: bool = True, pure: bool = False):
+    """Invoke MediaMonkey's ``runJSCode`` bridge for advanced automations.
 
-    try:
-        return _get_client().run_js(code, expect_callback=expect_callback)
-    except MediaMonkeyUnavailableError as exc:
-        raise RuntimeError(str(exc)) from exc
+    Set ``pure`` for read-only scripts whose result never changes so repeat calls are served from cache.
+    """
+
+    return await _call_client(
+        lambda client: client.run_js(code, expect_callback=expect_callback, pure=pure)
+    )
 
 
 @mcp.tool()
@@ -130,15 +195,14 @@ async def invoke_menu_item(
 ) -> dict:
     """Trigger a MediaMonkey menu item using ``SDB.UI`` menus and toolbars."""
 
-    try:
-        result = _get_client().invoke_menu_item(
+    result = await _call_client(
+        lambda client: client.invoke_menu_item(
             scope=scope,
             path=path,
             match_strategy=match_strategy,
             allow_disabled=allow_disabled,
         )
-    except MediaMonkeyUnavailableError as exc:
-        raise RuntimeError(str(exc)) from exc
+    )
     return result.model_dump()
 
 
@@ -152,16 +216,15 @@ async def set_config_value(
 ) -> dict:
     """Mutation helper around ``SDB.IniFile`` for MediaMonkey configuration entries."""
 
-    try:
-        result = _get_client().set_config_value(
+    result = await _call_client(
+        lambda client: client.set_config_value(
             section=section,
             key=key,
             value=value,
             value_type=value_type,
             persist_mode=persist_mode,
         )
-    except MediaMonkeyUnavailableError as exc:
-        raise RuntimeError(str(exc)) from exc
+    )
     return result.model_dump()
 
 
@@ -2,9 +2,14 @@
 
 # pylint: disable=protected-access
 
+import json
 import types
 
+import pytest
+from pydantic import ValidationError
+
 import mm2024_mcp.media_monkey_client as mmc
+from mm2024_mcp.models import BatchOp
 
 
 def test_normalize_menu_label_strips_accelerators_and_ellipsis() -> None:
@@ -13,10 +18,19 @@ def test_normalize_menu_label_strips_accelerators_and_ellipsis() -> None:
 
 
 def test_caption_matches_strategies() -> None:
-    assert mmc._caption_matches("play", "pl", "startswith")
-    assert mmc._caption_matches("playback", "back", "contains")
-    assert mmc._caption_matches("options", "options", "exact")
-    assert not mmc._caption_matches("options", "xyz", "contains")
+    assert mmc._MENU_MATCHERS["startswith"]("play", "pl")
+    assert mmc._MENU_MATCHERS["contains"]("playback", "back")
+    assert mmc._MENU_MATCHERS["exact"]("options", "options")
+    assert not mmc._MENU_MATCHERS["contains"]("options", "xyz")
+
+
+def test_resolve_menu_child_uses_matcher_on_normalized_captions() -> None:
+    children = [types.SimpleNamespace(Caption="&File"), types.SimpleNamespace(Caption="&Playback...")]
+    parent = types.SimpleNamespace(SubItems=types.SimpleNamespace(Count=2, Item=children.__getitem__))
+
+    assert mmc._resolve_menu_child(parent, "play", mmc._MENU_MATCHERS["startswith"]) is children[1]
+    assert mmc._resolve_menu_child(parent, "Back", mmc._MENU_MATCHERS["contains"]) is children[1]
+    assert mmc._resolve_menu_child(parent, "play", mmc._MENU_MATCHERS["exact"]) is None
 
 
 def test_coerce_ini_input_and_result() -> None:
@@ -77,3 +91,385 @@ def test_iterate_menu_children_handles_collections() -> None:
 
     menu = _Menu()
     assert list(mmc._iterate_menu_children(menu)) == [child]
+
+
+class _FakeSong:
+    Title = "Song"
+    ArtistName = "Artist"
+    AlbumName = "Album"
+    AlbumArtistName = ""
+    Genre = "Rock"
+    Year = 1999
+    TrackOrder = 3
+    SongLength = 180000
+    Path = "C:\\Music\\song.mp3"
+    Rating = 80
+    SongID = 42
+
+
+class _FakePlayer:
+    def __init__(self) -> None:
+        self.isPlaying = True
+        self.isPaused = False
+        self.isShuffle = False
+        self.isRepeat = True
+        self.StopAfterCurrent = False
+        self.Volume = 55
+        self.PlaybackTime = 1000
+        self.CurrentSongIndex = 0
+        self.CurrentSong = _FakeSong()
+        self.CurrentSongList = types.SimpleNamespace(Count=1, Item=lambda index: self.CurrentSong)
+        self.calls: list[str] = []
+
+    def Play(self) -> None:  # noqa: N802
+        self.calls.append("Play")
+        self.isPlaying = True
+
+    def Pause(self) -> None:  # noqa: N802
+        self.calls.append("Pause")
+        self.isPlaying = False
+
+    def Stop(self) -> None:  # noqa: N802
+        self.calls.append("Stop")
+
+    def Next(self) -> None:  # noqa: N802
+        self.calls.append("Next")
+
+    def Previous(self) -> None:  # noqa: N802
+        self.calls.append("Previous")
+
+
+class _FakeSDB:
+    def __init__(self, js_result=None) -> None:
+        self.Player = _FakePlayer()
+        self.js_result = js_result
+        self.js_calls: list[str] = []
+        self.registered: list[str] = []
+
+    def runJSCode(self, code: str, wait: bool):  # noqa: N802
+        if not wait:
+            self.registered.append(code)
+            return None
+        self.js_calls.append(code)
+        if isinstance(self.js_result, Exception):
+            raise self.js_result
+        if isinstance(self.js_result, list):
+            return self.js_result.pop(0)
+        return self.js_result
+
+
+def _make_client(monkeypatch, sdb: _FakeSDB) -> mmc.MediaMonkeyClient:
+    monkeypatch.setattr(mmc, "pythoncom", types.SimpleNamespace(CoInitializeEx=lambda flags: None))
+    fake_client = types.SimpleNamespace(Dispatch=lambda prog_id: sdb)
+    monkeypatch.setattr(mmc, "win32com", types.SimpleNamespace(client=fake_client))
+    return mmc.MediaMonkeyClient()
+
+
+def _js_song(**fields) -> dict:
+    return {**dict.fromkeys(mmc._TRACK_KEYS), **fields}
+
+
+def _js_state(**fields) -> str:
+    data = {
+        "isPlaying": True,
+        "isPaused": False,
+        "isShuffle": True,
+        "isRepeat": False,
+        "StopAfterCurrent": False,
+        "Volume": 30,
+        "PlaybackTime": 2500,
+        "CurrentSongIndex": 4,
+        "CurrentSongListCount": 10,
+        "CurrentSong": _js_song(Title=" Batched ", SongLength=200000, SongID=7, AlbumName=""),
+    }
+    return json.dumps({"ok": True, "data": {**data, **fields}})
+
+
+def test_playback_state_reads_batched_js_payload(monkeypatch) -> None:
+    sdb = _FakeSDB(js_result=_js_state())
+    state = _make_client(monkeypatch, sdb).get_playback_state()
+
+    assert len(sdb.js_calls) == 1
+    assert state.shuffle is True
+    assert state.volume == 30
+    assert state.current_index == 4
+    assert state.now_playing_size == 10
+    assert state.track_length_ms == 200000
+    assert state.track is not None
+    assert state.track.title == "Batched"
+    assert state.track.album is None
+    assert state.track.song_id == 7
+
+
+def test_playback_state_falls_back_to_com_when_js_fails(monkeypatch) -> None:
+    sdb = _FakeSDB(js_result=json.dumps({"ok": False, "error": "app.Player is undefined"}))
+    state = _make_client(monkeypatch, sdb).get_playback_state()
+
+    assert state.volume == 55
+    assert state.repeat is True
+    assert state.now_playing_size == 1
+    assert state.track is not None
+    assert state.track.album_artist is None
+    assert state.track.song_id == 42
+
+
+def test_playback_payload_with_missing_keys_falls_back_to_com(monkeypatch) -> None:
+    sdb = _FakeSDB(js_result=[json.dumps({"ok": True, "data": {}}), _js_state()])
+    client = _make_client(monkeypatch, sdb)
+
+    state = client.get_playback_state()
+    assert (state.volume, state.repeat, state.track.song_id) == (55, True, 42)
+    assert len(sdb.js_calls) == 1
+
+
+def test_now_playing_payload_with_missing_track_keys_falls_back_to_com(monkeypatch) -> None:
+    sdb = _FakeSDB(js_result=json.dumps({"ok": True, "data": [{"Title": "One", "SongID": 1}]}))
+    tracks = _make_client(monkeypatch, sdb).now_playing(limit=5)
+
+    assert [track.song_id for track in tracks] == [42]
+
+
+def test_malformed_js_batch_is_not_retried(monkeypatch) -> None:
+    sdb = _FakeSDB(js_result=json.dumps({"ok": True, "data": "not an object"}))
+    client = _make_client(monkeypatch, sdb)
+
+    for _ in range(3):
+        client._state_cache = None
+        assert client.get_playback_state().volume == 55
+    assert client.now_playing(limit=5)[0].song_id == 42
+    assert len(sdb.js_calls) == 1
+
+
+def test_failed_js_batch_is_retried_after_backoff(monkeypatch) -> None:
+    payload = {"ok": True, "data": [_js_song(Title="Queued", SongID=1)]}
+    sdb = _FakeSDB(js_result=[json.dumps({"ok": False, "error": "app.player is undefined"}), json.dumps(payload)])
+    client = _make_client(monkeypatch, sdb)
+    clock = [100.0]
+    monkeypatch.setattr(mmc.time, "monotonic", lambda: clock[0])
+
+    assert client.now_playing(limit=5)[0].title == "Song"
+    assert client.now_playing(limit=5)[0].title == "Song"
+    assert len(sdb.js_calls) == 1
+
+    clock[0] += mmc._JS_BATCH_RETRY_SECONDS
+    assert client.now_playing(limit=5)[0].title == "Queued"
+    assert len(sdb.js_calls) == 2
+
+
+def test_playback_state_is_cached_until_mutation(monkeypatch) -> None:
+    sdb = _FakeSDB(js_result=RuntimeError("bridge offline"))
+    client = _make_client(monkeypatch, sdb)
+
+    first = client.get_playback_state()
+    assert client.get_playback_state() is first
+    assert len(sdb.js_calls) == 1
+
+    state = client.set_volume(20)
+    assert state is not first
+    assert state.volume == 20
+
+
+def test_mutation_on_one_client_invalidates_another(monkeypatch) -> None:
+    sdb = _FakeSDB(js_result=RuntimeError("bridge offline"))
+    reader = _make_client(monkeypatch, sdb)
+    writer = _make_client(monkeypatch, sdb)
+
+    assert reader.get_playback_state().volume == 55
+    writer.set_volume(20)
+    assert reader.get_playback_state().volume == 20
+
+
+def test_dispatch_application_prefers_early_binding(monkeypatch) -> None:
+    early, late = object(), object()
+    gencache = types.SimpleNamespace(EnsureDispatch=lambda prog_id: early)
+    fake_client = types.SimpleNamespace(gencache=gencache, Dispatch=lambda prog_id: late)
+    monkeypatch.setattr(mmc, "win32com", types.SimpleNamespace(client=fake_client))
+
+    assert mmc._dispatch_application("SongsDB5.SDBApplication") is early
+
+
+def test_dispatch_application_falls_back_to_late_binding(monkeypatch) -> None:
+    late = object()
+    requested: list[str] = []
+
+    def ensure_dispatch(prog_id):
+        requested.append(prog_id)
+        raise mmc.com_error("Library not registered")
+
+    gencache = types.SimpleNamespace(EnsureDispatch=ensure_dispatch)
+    fake_client = types.SimpleNamespace(gencache=gencache, Dispatch=lambda prog_id: late)
+    monkeypatch.setattr(mmc, "win32com", types.SimpleNamespace(client=fake_client))
+
+    assert mmc._dispatch_application("SongsDB5.SDBApplication") is late
+    assert requested == ["SongsDB5.SDBApplication"]
+
+
+def test_get_property_resolves_dispids_once(monkeypatch) -> None:
+    class _OleObj:
+        def __init__(self) -> None:
+            self.lookups: list[str] = []
+
+        def GetIDsOfNames(self, name):  # noqa: N802
+            self.lookups.append(name)
+            return len(self.lookups)
+
+        def Invoke(self, dispid, lcid, flags, result):  # noqa: N802
+            return {1: "Title", 2: 1999}[dispid]
+
+    monkeypatch.setattr(mmc, "pythoncom", types.SimpleNamespace(DISPATCH_PROPERTYGET=2))
+    ole = _OleObj()
+    song = types.SimpleNamespace(_oleobj_=ole)
+    dispids: dict[str, int] = {}
+
+    for _ in range(3):
+        assert mmc._read(song, "Title", "s", dispids) == "Title"
+        assert mmc._read(song, "Year", "i", dispids) == 1999
+    assert ole.lookups == ["Title", "Year"]
+
+
+def test_read_coerces_and_falls_back_to_default() -> None:
+    player = types.SimpleNamespace(isPlaying=1, Volume="40", PlaybackTime=None)
+
+    assert mmc._read(player, "isPlaying", "b", default=False) is True
+    assert mmc._read(player, "Volume", "i", default=0) == 40
+    assert mmc._read(player, "PlaybackTime", "i", default=0) == 0
+    assert mmc._read(player, "CurrentSongIndex", "i", default=-1) == -1
+
+
+def test_run_js_caches_pure_scripts(monkeypatch) -> None:
+    sdb = _FakeSDB(js_result=json.dumps({"ok": True, "data": "MediaMonkey 2024"}))
+    client = _make_client(monkeypatch, sdb)
+
+    assert client.run_js("return app.versionString;", pure=True) == "MediaMonkey 2024"
+    assert client.run_js("return app.versionString;", pure=True) == "MediaMonkey 2024"
+    assert len(sdb.js_calls) == 1
+    assert sdb.registered == [mmc._RUNJS_HELPER_JS]
+    assert sdb.js_calls[0] == (
+        mmc._RUNJS_HELPER_CALL_PREFIX + '"return app.versionString;"' + mmc._RUNJS_HELPER_CALL_SUFFIX
+    )
+
+    client.run_js("return app.versionString;")
+    assert len(sdb.js_calls) == 2
+
+
+def test_run_js_pure_cache_returns_independent_copies(monkeypatch) -> None:
+    sdb = _FakeSDB(js_result=json.dumps({"ok": True, "data": {"tracks": [1, 2]}}))
+    client = _make_client(monkeypatch, sdb)
+
+    first = client.run_js("return app.stats;", pure=True)
+    first["tracks"].append(3)
+    second = client.run_js("return app.stats;", pure=True)
+    second["tracks"].clear()
+
+    assert client.run_js("return app.stats;", pure=True) == {"tracks": [1, 2]}
+    assert len(sdb.js_calls) == 1
+
+
+def test_run_js_round_trips_lone_surrogates(monkeypatch) -> None:
+    sdb = _FakeSDB(js_result=json.dumps({"ok": True, "data": "\ud800"}))
+    client = _make_client(monkeypatch, sdb)
+
+    assert client.run_js('return "\ud800";') == "\ud800"
+    assert sdb.js_calls[0] == (
+        mmc._RUNJS_HELPER_CALL_PREFIX + '"return \\"\\ud800\\";"' + mmc._RUNJS_HELPER_CALL_SUFFIX
+    )
+
+
+def test_now_playing_reads_batched_js_payload(monkeypatch) -> None:
+    songs = [_js_song(Title="One", SongID=1), _js_song(Title="Two", SongID=2)]
+    sdb = _FakeSDB(js_result=json.dumps({"ok": True, "data": songs}))
+    tracks = _make_client(monkeypatch, sdb).now_playing(limit=2)
+
+    assert [track.title for track in tracks] == ["One", "Two"]
+    assert "Math.min(2," in sdb.js_calls[0]
+
+
+def test_control_playback_dispatches_through_action_table(monkeypatch) -> None:
+    sdb = _FakeSDB(js_result=RuntimeError("bridge offline"))
+    client = _make_client(monkeypatch, sdb)
+
+    assert client.control_playback("Toggle").is_playing is False
+    assert client.control_playback("next").is_playing is False
+    assert client.control_playback("stop_after_current").stop_after_current is True
+    assert sdb.Player.calls == ["Pause", "Next"]
+
+
+def test_execute_batch_reads_state_once(monkeypatch) -> None:
+    sdb = _FakeSDB(js_result=RuntimeError("bridge offline"))
+    client = _make_client(monkeypatch, sdb)
+
+    state = client.execute_batch(
+        [
+            BatchOp(action="set_volume", value=100),
+            BatchOp(action="seek", value=3000),
+            BatchOp(action="pause"),
+        ]
+    )
+
+    assert (state.volume, state.playback_time_ms, state.is_playing) == (100, 3000, False)
+    assert len(sdb.js_calls) == 1
+
+
+@pytest.mark.parametrize(
+    "op",
+    [
+        {"action": "seek"},
+        {"action": "set_volume"},
+        {"action": "set_volume", "value": 150},
+        {"action": "pause", "value": 5},
+    ],
+)
+def test_batch_op_rejects_invalid_values(op: dict) -> None:
+    with pytest.raises(ValidationError):
+        BatchOp(**op)
+
+
+def test_current_track_is_reused_while_song_id_matches(monkeypatch) -> None:
+    sdb = _FakeSDB(js_result=RuntimeError("bridge offline"))
+    client = _make_client(monkeypatch, sdb)
+
+    first = client.get_playback_state().track
+    client._state_cache = None
+    sdb.Player.CurrentSong.Title = "Renamed"
+    assert client.get_playback_state().track is first
+
+    sdb.Player.CurrentSong.SongID = 43
+    client._state_cache = None
+    track = client.get_playback_state().track
+    assert track is not None
+    assert track.title == "Renamed"
+
+
+def test_track_without_library_id_is_not_reused(monkeypatch) -> None:
+    sdb = _FakeSDB(js_result=RuntimeError("bridge offline"))
+    sdb.Player.CurrentSong.SongID = 0
+    client = _make_client(monkeypatch, sdb)
+
+    client.get_playback_state()
+    client._state_cache = None
+    sdb.Player.CurrentSong.Title = "Other file"
+    track = client.get_playback_state().track
+    assert track is not None
+    assert track.title == "Other file"
+    assert client._last_track_cache is None
+
+
+def test_batched_js_payload_always_builds_fresh_track(monkeypatch) -> None:
+    sdb = _FakeSDB(
+        js_result=[_js_state(CurrentSong=_js_song(Title=title, SongID=7)) for title in ("Before", "After")]
+    )
+    client = _make_client(monkeypatch, sdb)
+
+    assert client.get_playback_state().track.title == "Before"
+    client._state_cache = None
+    assert client.get_playback_state().track.title == "After"
+
+
+def test_run_js_reregisters_missing_helper_and_runs_inline(monkeypatch) -> None:
+    missing = {"ok": False, "helperMissing": True, "error": "__mmMcpRun is not registered"}
+    sdb = _FakeSDB(js_result=[json.dumps(missing), json.dumps({"ok": True, "data": 3})])
+    client = _make_client(monkeypatch, sdb)
+
+    assert client.run_js("return 1 + 2;") == 3
+    assert len(sdb.registered) == 2
+    assert sdb.js_calls[1].startswith(mmc._RUNJS_WRAPPER_PREFIX)
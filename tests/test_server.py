@@ -0,0 +1,105 @@
+"""Unit tests for the MCP tool layer."""
+
+# pylint: disable=protected-access
+
+import asyncio
+import threading
+
+import pytest
+
+import mm2024_mcp.server as srv
+from mm2024_mcp.models import PlaybackState, TrackInfo
+
+
+def _state(volume: int = 50) -> PlaybackState:
+    return PlaybackState(
+        is_playing=True,
+        is_paused=False,
+        shuffle=False,
+        repeat=False,
+        stop_after_current=False,
+        volume=volume,
+        playback_time_ms=0,
+        track=TrackInfo(title="Song", song_id=1),
+    )
+
+
+@pytest.mark.parametrize(("raw", "expected"), [("4", 4), ("0", 1), ("abc", 1), ("", 1)])
+def test_com_worker_count_parses_environment(monkeypatch, raw: str, expected: int) -> None:
+    monkeypatch.setenv("MM2024_COM_WORKERS", raw)
+    assert srv._com_worker_count() == expected
+
+
+def test_serialize_state_reuses_dump_for_same_instance(monkeypatch) -> None:
+    monkeypatch.setattr(srv, "_last_serialized", None)
+    state = _state()
+
+    first = srv._serialize_state(state)
+    cached = srv._last_serialized
+    second = srv._serialize_state(state)
+    assert srv._last_serialized is cached
+    assert second == first
+
+    # Responses are independent copies, including the nested track.
+    first["volume"] = 0
+    first["track"]["title"] = "Mutated"
+    assert srv._serialize_state(state)["volume"] == 50
+    assert srv._serialize_state(state)["track"]["title"] == "Song"
+
+
+def test_serialize_state_misses_after_new_snapshot(monkeypatch) -> None:
+    monkeypatch.setattr(srv, "_last_serialized", None)
+    srv._serialize_state(_state(volume=50))
+
+    # A mutation makes the client return a fresh PlaybackState instance.
+    assert srv._serialize_state(_state(volume=20))["volume"] == 20
+
+
+class _StubClient:
+    def __init__(self, state: PlaybackState) -> None:
+        self.state = state
+        self.calls = 0
+        self.release = threading.Event()
+
+    def get_playback_state(self) -> PlaybackState:
+        self.calls += 1
+        assert self.release.wait(timeout=5)
+        return self.state
+
+
+def test_get_playback_state_coalesces_concurrent_calls(monkeypatch) -> None:
+    client = _StubClient(_state())
+    monkeypatch.setattr(srv, "_get_client", lambda: client)
+
+    async def scenario() -> list[dict]:
+        calls = [asyncio.ensure_future(srv.get_playback_state()) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        client.release.set()
+        return await asyncio.gather(*calls)
+
+    results = asyncio.run(scenario())
+
+    assert client.calls == 1
+    assert all(result["volume"] == 50 for result in results)
+    # Coalesced callers share one read but never one response dict.
+    assert len({id(result) for result in results}) == len(results)
+    assert srv._inflight_state is None
+
+
+def test_get_playback_state_survives_cancelled_caller(monkeypatch) -> None:
+    client = _StubClient(_state(volume=30))
+    monkeypatch.setattr(srv, "_get_client", lambda: client)
+
+    async def scenario() -> dict:
+        first = asyncio.ensure_future(srv.get_playback_state())
+        second = asyncio.ensure_future(srv.get_playback_state())
+        await asyncio.sleep(0.05)
+        first.cancel()
+        client.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario())["volume"] == 30
+    assert client.calls == 1
+    assert srv._inflight_state is None